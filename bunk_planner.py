@@ -0,0 +1,145 @@
+import datetime
+
+# --- Weekly Bunk Planner ---
+# Picks whole blocks of next week's timetable (days, mornings, afternoons) that can be skipped
+# together while every subject stays at or above 75% attendance after each class of the week,
+# not just at the end of it.
+
+MORNING_CUTOFF = datetime.time(13, 0) # Slots starting before the lunch break count as "morning"
+WEEK_DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+def slot_start(time_val):
+    # "08:00 - 08:50 (Theory)" -> datetime.time(8, 0)
+    hh, mm = time_val.split(' ')[0].split(':')
+    return datetime.time(int(hh), int(mm))
+
+def bunk_capacity(attended, conducted, upcoming):
+    # Most of the `upcoming` classes that can be skipped so that
+    # (attended + upcoming - b) / (conducted + upcoming) >= 0.75, i.e. 4(A + n - b) >= 3(C + n)
+    return max((4 * attended + upcoming - 3 * conducted) // 4, 0)
+
+def bunk_limits(attended, conducted, upcoming):
+    # limits[k] = most bunks allowed among the first k+1 classes of the week, from
+    # 4(A + (k+1) - b) >= 3(C + (k+1)). Never negative, so attending everything always "fits".
+    return [bunk_capacity(attended, conducted, k + 1) for k in range(upcoming)]
+
+def within_limits(positions, limits):
+    # positions: sorted indexes (in time order) of the classes skipped. The percentage only drops
+    # on a bunk, so checking right after each one covers every point of the week.
+    return all(rank <= limits[p] for rank, p in enumerate(positions, 1))
+
+def spare_bunks(positions, limits):
+    # How many more classes could still be skipped. Later classes sit in fewer running totals,
+    # so taking them latest-first is optimal.
+    taken = set(positions)
+    extra = 0
+    for p in range(len(limits) - 1, -1, -1):
+        if p in taken: continue
+        trial = sorted(taken | {p})
+        if within_limits(trial, limits):
+            taken.add(p)
+            extra += 1
+    return extra
+
+def week_order(slot):
+    day = WEEK_DAYS.index(slot["day"]) if slot["day"] in WEEK_DAYS else 7
+    return (day, slot_start(slot["time"]))
+
+def block_label(day, kind):
+    return day if kind == "day" else f"{day} {kind}"
+
+OBJECTIVES = {
+    # name -> (label, function(day, start_time) -> block kind or None)
+    "free_days": ("Free days", lambda day, start: "day"),
+    "free_mornings": ("Free mornings", lambda day, start: "morning" if start < MORNING_CUTOFF else None),
+    "free_afternoons": ("Free afternoons", lambda day, start: "afternoon" if start >= MORNING_CUTOFF else None),
+}
+
+def plan_bunks(subjects, objective="free_days"):
+    # Returns the plan freeing the most blocks for the objective; ties go to the plan that uses
+    # the fewest bunks, so the remaining margin stays as large as possible.
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Unknown objective: {objective}")
+    block_of = OBJECTIVES[objective][1]
+
+    # 1. Next week's classes per subject in time order, with the running bunk limit after each
+    limits, order = [], []
+    for sub in subjects:
+        ranked = sorted(range(len(sub.schedule)), key=lambda j: week_order(sub.schedule[j]))
+        order.append({j: pos for pos, j in enumerate(ranked)})
+        limits.append(bunk_limits(sub.attended, sub.conducted, len(sub.schedule)))
+
+    # 2. Group next week's classes into blocks; each block skips some class positions per subject
+    blocks = {} # (day, kind) -> {"cost": {sub_idx: [positions]}, "slots": [(sub, slot)]}
+    for i, sub in enumerate(subjects):
+        for j, slot in enumerate(sub.schedule):
+            kind = block_of(slot["day"], slot_start(slot["time"]))
+            if kind is None: continue
+            block = blocks.setdefault((slot["day"], kind), {"cost": {}, "slots": []})
+            block["cost"].setdefault(i, []).append(order[i][j])
+            block["slots"].append((sub, slot))
+
+    def fits_with(taken, cost):
+        return all(within_limits(sorted((*taken[i], *ps)), limits[i]) for i, ps in cost)
+
+    # Blocks that break a running limit on their own can never be picked
+    empty = [()] * len(subjects)
+    candidates = [(key, b) for key, b in blocks.items() if fits_with(empty, b["cost"].items())]
+    # Cheapest blocks first so the search finds a good incumbent early and prunes harder
+    candidates.sort(key=lambda kb: (sum(len(ps) for ps in kb[1]["cost"].values()), WEEK_DAYS.index(kb[0][0]) if kb[0][0] in WEEK_DAYS else 7))
+    costs = [tuple(sorted((i, tuple(ps)) for i, ps in b["cost"].items())) for _, b in candidates]
+    weights = [sum(len(ps) for _, ps in cost) for cost in costs]
+
+    # 3. Branch-and-bound over take/skip decisions. Extra bunks only ever tighten the limits, so
+    #    the bound counts the blocks left that still fit on their own; branches that can't beat
+    #    the best plan are cut.
+    best = {"score": (0, 0), "picks": ()}
+
+    def fits(idx, taken):
+        return fits_with(taken, costs[idx])
+
+    def search(idx, taken, picks, bunks):
+        score = (len(picks), -bunks)
+        if score > best["score"]:
+            best["score"], best["picks"] = score, picks
+        if idx == len(candidates): return
+
+        bound = len(picks) + sum(1 for j in range(idx, len(candidates)) if fits(j, taken))
+        # Reaching the best count again would cost more bunks than we already have -> no gain
+        if bound < best["score"][0] or (bound == best["score"][0] and bunks >= -best["score"][1]):
+            return
+
+        if fits(idx, taken):
+            after = list(taken)
+            for i, ps in costs[idx]:
+                after[i] = after[i] + ps
+            search(idx + 1, after, picks + (idx,), bunks + weights[idx])
+        search(idx + 1, taken, picks, bunks)
+
+    search(0, empty, (), 0)
+    picked = [candidates[i] for i in best["picks"]]
+
+    # 4. Projected attendance if the plan is followed and every other class is attended
+    skipped = [[] for _ in subjects]
+    slots = []
+    for _, b in picked:
+        for i, ps in b["cost"].items():
+            skipped[i] += ps
+        slots += b["slots"]
+
+    projected = []
+    for i, sub in enumerate(subjects):
+        n = len(sub.schedule)
+        conducted = sub.conducted + n
+        attended = sub.attended + n - len(skipped[i])
+        pct = (attended / conducted) * 100 if conducted else 0.0
+        projected.append((sub, pct, spare_bunks(sorted(skipped[i]), limits[i])))
+
+    picked.sort(key=lambda kb: (WEEK_DAYS.index(kb[0][0]) if kb[0][0] in WEEK_DAYS else 7, kb[0][1]))
+    return {
+        "objective": objective,
+        "blocks": [block_label(day, kind) for (day, kind), _ in picked],
+        "slots": slots,
+        "bunks": sum(len(ps) for ps in skipped),
+        "projected": projected, # (subject, projected %, bunks still spare)
+    }
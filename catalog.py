@@ -0,0 +1,275 @@
+import csv
+import logging
+import mmap
+import os
+import struct
+import sys
+import threading
+
+# --- Course Catalog ---
+# Read-only list of the university's courses, shared by every session of the server process.
+#
+# The CSV source (code,name,professor,slots) is compiled once into a compact binary file that is
+# memory-mapped, so records and indexes are paged in by the OS instead of living as Python
+# objects per session. `slots` is a ";"-separated list like "Monday 08:00 - 08:50 (Theory)".
+#
+# File layout (little-endian):
+#   header    | MAGIC, then the counts/offsets in HEADER_FMT
+#   records   | uint32 offset table + blob of "code\x1fname\x1fprof\x1fslots" UTF-8 records
+#   prefix    | fixed entries (key_off, key_len, record) sorted by lowercase key bytes
+#   keys      | blob of lowercase keys (code, full name, each name/professor word)
+#   trigrams  | fixed entries (trigram[12], postings_off, count) sorted by trigram bytes
+#   postings  | uint32 record ids, ascending per trigram
+
+CATALOG_CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)), "courses.csv")
+CATALOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "courses.bkc")
+
+MAGIC = b"BKC1"
+HEADER_FMT = "<4sIIIIIIIIII"
+HEADER_SIZE = struct.calcsize(HEADER_FMT)
+PREFIX_FMT = "<IHI"
+PREFIX_SIZE = struct.calcsize(PREFIX_FMT)
+TRIGRAM_FMT = "<12sII"
+TRIGRAM_SIZE = struct.calcsize(TRIGRAM_FMT)
+SEP = "\x1f"
+
+log = logging.getLogger(__name__)
+
+def normalize(text):
+    return " ".join(text.lower().split())
+
+def trigrams(text):
+    text = normalize(text)
+    return {text[i:i + 3].encode("utf-8") for i in range(len(text) - 2)}
+
+def parse_slots(raw):
+    schedule = []
+    for part in raw.split(";"):
+        part = part.strip()
+        if not part: continue
+        day, _, time_val = part.partition(" ")
+        schedule.append({"day": day, "time": time_val.strip()})
+    return schedule
+
+def check_slots(raw):
+    # Splits a CSV slots cell into the slots the timetable grid can show (a DAYS day and one of the
+    # GRID_TIME_SLOTS times) and the rejected parts. main.py is imported here rather than at module
+    # level because the app imports this module.
+    from main import DAYS, GRID_TIME_SLOTS
+
+    times = {t for _, t in GRID_TIME_SLOTS}
+    good, bad = [], []
+    for part in raw.split(";"):
+        part = part.strip()
+        if not part: continue
+        day, _, time_val = part.partition(" ")
+        if day in DAYS and time_val.strip() in times:
+            good.append(f"{day} {time_val.strip()}")
+        else:
+            bad.append(part)
+    return good, bad
+
+# --- Building ---
+
+def build_catalog(csv_path, out_path):
+    # Bad slots are dropped (and logged with their CSV line) at compile time, so every slot the app
+    # reads from the catalog is one the reminders, planner and timetable grid understand.
+    rows = []
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        for r in reader:
+            if not (r.get("code") or r.get("name")): continue
+            good, bad = check_slots((r.get("slots") or "").strip())
+            if bad:
+                log.warning("%s line %d: dropped unknown slots %s", csv_path, reader.line_num, "; ".join(bad))
+            r["slots"] = "; ".join(good)
+            rows.append(r)
+
+    blob = bytearray()
+    rec_offsets = []
+    prefix_keys = []    # (key bytes, record id)
+    tri_postings = {}   # trigram bytes -> [record ids]
+
+    for rec_id, row in enumerate(rows):
+        code = (row.get("code") or "").strip()
+        name = (row.get("name") or "").strip()
+        prof = (row.get("professor") or "").strip()
+        slots = (row.get("slots") or "").strip()
+        rec_offsets.append(len(blob))
+        blob += SEP.join([code, name, prof, slots]).encode("utf-8")
+
+        keys = {normalize(code), normalize(name)}
+        keys.update(normalize(name).split())
+        keys.update(normalize(prof).split())
+        for key in keys:
+            if key: prefix_keys.append((key.encode("utf-8"), rec_id))
+
+        for tri in trigrams(f"{code} {name} {prof}"):
+            if len(tri) <= 12:
+                tri_postings.setdefault(tri, []).append(rec_id)
+    rec_offsets.append(len(blob))
+
+    prefix_keys.sort()
+    keys_blob = bytearray()
+    prefix_entries = bytearray()
+    for key, rec_id in prefix_keys:
+        prefix_entries += struct.pack(PREFIX_FMT, len(keys_blob), len(key), rec_id)
+        keys_blob += key
+
+    tri_entries = bytearray()
+    postings = bytearray()
+    for tri in sorted(tri_postings):
+        ids = tri_postings[tri]
+        tri_entries += struct.pack(TRIGRAM_FMT, tri, len(postings) // 4, len(ids))
+        postings += struct.pack(f"<{len(ids)}I", *ids)
+
+    rec_index = struct.pack(f"<{len(rec_offsets)}I", *rec_offsets)
+    rec_index_off = HEADER_SIZE
+    rec_blob_off = rec_index_off + len(rec_index)
+    prefix_off = rec_blob_off + len(blob)
+    keys_off = prefix_off + len(prefix_entries)
+    tri_off = keys_off + len(keys_blob)
+    post_off = tri_off + len(tri_entries)
+    header = struct.pack(
+        HEADER_FMT, MAGIC, len(rows), rec_index_off, rec_blob_off,
+        prefix_off, len(prefix_keys), keys_off, tri_off, len(tri_postings), post_off, 0
+    )
+
+    tmp_path = out_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        for part in (header, rec_index, blob, prefix_entries, keys_blob, tri_entries, postings):
+            f.write(part)
+    os.replace(tmp_path, out_path) # Atomic swap so running servers never map a half-written file
+
+# --- Reading ---
+
+class CourseCatalog:
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, self.count, self._rec_index_off, self._rec_blob_off, self._prefix_off, self._n_prefix,
+         self._keys_off, self._tri_off, self._n_tri, self._post_off, _) = struct.unpack_from(HEADER_FMT, self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a course catalog file")
+
+    def __len__(self):
+        return self.count
+
+    def close(self):
+        self._mm.close()
+        self._file.close()
+
+    def course(self, rec_id):
+        start, end = struct.unpack_from("<II", self._mm, self._rec_index_off + rec_id * 4)
+        raw = self._mm[self._rec_blob_off + start:self._rec_blob_off + end].decode("utf-8")
+        code, name, prof, slots = raw.split(SEP)
+        return {"code": code, "name": name, "professor": prof, "schedule": parse_slots(slots)}
+
+    def _prefix_key(self, i):
+        key_off, key_len, rec_id = struct.unpack_from(PREFIX_FMT, self._mm, self._prefix_off + i * PREFIX_SIZE)
+        start = self._keys_off + key_off
+        return self._mm[start:start + key_len], rec_id
+
+    def _prefix_matches(self, prefix, limit, seen):
+        # Binary search for the first key >= prefix, then walk forward while keys still match
+        lo, hi = 0, self._n_prefix
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._prefix_key(mid)[0] < prefix: lo = mid + 1
+            else: hi = mid
+        found = []
+        i = lo
+        while i < self._n_prefix and len(found) < limit:
+            key, rec_id = self._prefix_key(i)
+            if not key.startswith(prefix): break
+            if rec_id not in seen:
+                seen.add(rec_id)
+                found.append(rec_id)
+            i += 1
+        return found
+
+    def _postings(self, tri):
+        lo, hi = 0, self._n_tri
+        key = tri.ljust(12, b"\0")
+        while lo < hi:
+            mid = (lo + hi) // 2
+            entry, off, count = struct.unpack_from(TRIGRAM_FMT, self._mm, self._tri_off + mid * TRIGRAM_SIZE)
+            if entry < key: lo = mid + 1
+            elif entry > key: hi = mid
+            else: return struct.unpack_from(f"<{count}I", self._mm, self._post_off + off * 4)
+        return ()
+
+    def _trigram_matches(self, query, limit, seen):
+        # Intersect posting lists (shortest first), then confirm the substring on the record itself
+        tris = [t for t in trigrams(query) if len(t) <= 12]
+        if not tris: return []
+        lists = sorted((self._postings(t) for t in tris), key=len)
+        if not lists[0]: return []
+        candidates = set(lists[0])
+        for ids in lists[1:]:
+            candidates.intersection_update(ids)
+            if not candidates: return []
+        found = []
+        for rec_id in sorted(candidates):
+            if rec_id in seen: continue
+            c = self.course(rec_id)
+            if query in normalize(f"{c['code']} {c['name']} {c['professor']}"):
+                seen.add(rec_id)
+                found.append(rec_id)
+                if len(found) >= limit: break
+        return found
+
+    def search(self, query, limit=8):
+        # Prefix hits on code/name/word come first, substring (trigram) hits fill the rest
+        query = normalize(query)
+        if not query: return []
+        seen = set()
+        ids = self._prefix_matches(query.encode("utf-8"), limit, seen)
+        if len(ids) < limit and len(query) >= 3:
+            ids += self._trigram_matches(query, limit - len(ids), seen)
+        return [self.course(i) for i in ids]
+
+# --- Process-wide instance ---
+
+_catalog = None
+_catalog_loaded = False
+_catalog_lock = threading.Lock()
+
+def catalog_is_stale(csv_path=CATALOG_CSV, path=CATALOG_PATH):
+    if not os.path.exists(csv_path): return False
+    return not os.path.exists(path) or os.path.getmtime(csv_path) > os.path.getmtime(path)
+
+def compile_catalog(csv_path=CATALOG_CSV, path=CATALOG_PATH):
+    # Run offline (`python catalog.py`) or once at server startup, never from a session:
+    # parsing and indexing the CSV is far too slow to do behind the lock while students wait.
+    if not catalog_is_stale(csv_path, path): return False
+    try:
+        build_catalog(csv_path, path)
+    except (OSError, ValueError, csv.Error, struct.error) as ex:
+        log.error("Could not compile course catalog %s: %s", csv_path, ex)
+        return False
+    return True
+
+def get_catalog():
+    # Maps the compiled file once per server process; this only opens the file, it never compiles.
+    # Returns None when no catalog is installed, in which case subjects are entered by hand.
+    global _catalog, _catalog_loaded
+    with _catalog_lock:
+        if not _catalog_loaded:
+            _catalog_loaded = True
+            if not os.path.exists(CATALOG_PATH): return None
+            if catalog_is_stale():
+                log.warning("%s is newer than %s; run `python catalog.py` to recompile", CATALOG_CSV, CATALOG_PATH)
+            try:
+                _catalog = CourseCatalog(CATALOG_PATH)
+            except (OSError, ValueError, struct.error) as ex:
+                log.error("Course catalog unavailable: %s", ex)
+                _catalog = None
+        return _catalog
+
+if __name__ == "__main__":
+    # python catalog.py courses.csv [courses.bkc]
+    src = sys.argv[1] if len(sys.argv) > 1 else CATALOG_CSV
+    dst = sys.argv[2] if len(sys.argv) > 2 else CATALOG_PATH
+    build_catalog(src, dst)
+    print(f"Wrote {len(CourseCatalog(dst))} courses to {dst}")
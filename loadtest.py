@@ -0,0 +1,259 @@
+import argparse
+import asyncio
+import concurrent.futures
+import datetime
+import gc
+import itertools
+import json
+import threading
+import time
+import tracemalloc
+
+import flet as ft
+from flet.core.connection import Connection
+from flet.core.protocol import CommandEncoder, PageCommandResponsePayload, PageCommandsBatchResponsePayload
+
+import main as app
+
+# --- Load Test Harness ---
+# Runs the real `main(page)` against many in-process sessions. Each session gets a flet Page
+# wired to LocalConnection, a stand-in for the websocket transport that answers control-id
+# requests locally and counts every message/byte the server would have pushed to a browser.
+#
+#   python loadtest.py --sessions 200 --workers 32
+
+class LocalConnection(Connection):
+    def __init__(self):
+        super().__init__()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self.messages = 0
+        self.bytes = 0
+
+    def _record(self, payload):
+        size = len(json.dumps(payload, cls=CommandEncoder, separators=(",", ":")))
+        with self._lock:
+            self.messages += 1
+            self.bytes += size
+
+    def send_command(self, session_id, command):
+        self._record(command)
+        return PageCommandResponsePayload(result="", error="")
+
+    def send_commands(self, session_id, commands):
+        self._record(commands)
+        # The client answers every "add" with the ids it gave the new controls, one per sub-command
+        results = []
+        for cmd in commands:
+            if cmd.name == "add":
+                with self._lock:
+                    results.append(" ".join(f"_{next(self._ids)}" for _ in cmd.commands))
+        return PageCommandsBatchResponsePayload(results=results, error="")
+
+    async def send_command_async(self, session_id, command):
+        return self.send_command(session_id, command)
+
+    async def send_commands_async(self, session_id, commands):
+        return self.send_commands(session_id, commands)
+
+class LocalClientStorage:
+    # Browser localStorage stand-in; each write is one message carrying the JSON value
+    def __init__(self, conn):
+        self.conn = conn
+        self._data = {}
+
+    def get(self, key):
+        return self._data.get(key)
+
+    def set(self, key, value):
+        self._data[key] = json.loads(json.dumps(value))
+        self.conn._record({"key": key, "value": value})
+        return True
+
+    def remove(self, key):
+        self._data.pop(key, None)
+        self.conn._record({"remove": key})
+        return True
+
+    def contains_key(self, key):
+        return key in self._data
+
+# --- Session Driving ---
+
+def walk(control):
+    yield control
+    for child in control._get_children():
+        if child is not None:
+            yield from walk(child)
+
+def find(root, predicate):
+    return next((c for c in walk(root) if predicate(c)), None)
+
+def open_dialog(page, title):
+    return find(page, lambda c: isinstance(c, ft.AlertDialog) and c.open and isinstance(c.title, ft.Text) and c.title.value == title)
+
+def button(root, text):
+    return find(root, lambda c: isinstance(c, ft.TextButton) and c.text == text)
+
+def fire(page, control, handler="on_click", name="click", data=""):
+    getattr(control, handler)(ft.ControlEvent(target=control.uid, name=name, data=data, control=control, page=page))
+
+def navigate(page, index):
+    page.navigation_bar.selected_index = index
+    fire(page, page.navigation_bar, "on_change", "change", str(index))
+
+class Session:
+    def __init__(self, session_id, loop, executor):
+        self.conn = LocalConnection()
+        self.page = ft.Page(self.conn, session_id, loop, executor)
+        # flet has no public hook for client storage, so the private attribute is swapped; fail
+        # loudly if an upgrade renames it rather than silently measuring round trips to nowhere
+        self.page._Page__client_storage = LocalClientStorage(self.conn)
+        if not isinstance(self.page.client_storage, LocalClientStorage):
+            raise RuntimeError("flet's Page no longer exposes __client_storage; update loadtest.Session")
+
+    def open_app(self):
+        app.main(self.page)
+        fire(self.page, button(open_dialog(self.page, "Welcome to Bunkinator"), "I Understand"))
+
+    def add_subject(self, n):
+        navigate(self.page, 2)
+        fire(self.page, self.page.floating_action_button)
+        dialog = open_dialog(self.page, "Add Subject")
+        name = find(dialog, lambda c: isinstance(c, ft.TextField) and c.label == "Subject Name")
+        name.value = f"Subject {n}"
+        fire(self.page, name, "on_change", "change", name.value)
+        fire(self.page, button(dialog, "Add"))
+
+    def mark_attendance(self):
+        navigate(self.page, 2)
+        card = find(self.page, lambda c: isinstance(c, app.SubjectCard))
+        fire(self.page, card)
+        fire(self.page, button(open_dialog(self.page, card.subject.name), "Present (+1)"))
+
+    def toggle_theme(self):
+        fire(self.page, self.page.appbar.actions[0])
+
+    def add_assignment(self, n):
+        navigate(self.page, 0)
+        fire(self.page, self.page.floating_action_button)
+        dialog = open_dialog(self.page, "Add Assignment")
+        find(dialog, lambda c: isinstance(c, ft.TextField) and c.label == "Title").value = f"Homework {n}"
+        dropdown = find(dialog, lambda c: isinstance(c, ft.Dropdown))
+        dropdown.value = dropdown.options[0].key
+        deadline = datetime.date.today() + datetime.timedelta(days=3)
+        find(dialog, lambda c: isinstance(c, ft.TextField) and c.label == "Deadline").value = str(deadline)
+        fire(self.page, button(dialog, "Save"))
+
+    def open_visual_view(self):
+        navigate(self.page, 1)
+        fire(self.page, find(self.page, lambda c: isinstance(c, ft.Container) and c.on_click is not None and isinstance(c.content, ft.Row) and any(isinstance(t, ft.Text) and t.value == "Visual View" for t in c.content.controls)))
+        fire(self.page, button(open_dialog(self.page, "Visual Timetable"), "Close"))
+
+    def close(self):
+        if self.page.on_close: self.page.on_close(None)
+
+SCRIPT = [
+    ("add subject", lambda s, i: s.add_subject(i)),
+    ("mark attendance", lambda s, i: s.mark_attendance()),
+    ("toggle theme", lambda s, i: s.toggle_theme()),
+    ("add assignment", lambda s, i: s.add_assignment(i)),
+    ("open visual view", lambda s, i: s.open_visual_view()),
+]
+
+# --- Measurement ---
+
+def percentile(sorted_vals, p):
+    if not sorted_vals: return 0.0
+    return sorted_vals[min(len(sorted_vals) - 1, int(round(p / 100 * (len(sorted_vals) - 1))))]
+
+def measure(samples, name, session, action):
+    msgs, nbytes = session.conn.messages, session.conn.bytes
+    start = time.perf_counter()
+    action()
+    elapsed = time.perf_counter() - start
+    samples.append((name, elapsed, session.conn.messages - msgs, session.conn.bytes - nbytes))
+
+def run_session(session, rounds, think):
+    samples = []
+    for i in range(rounds):
+        for name, step in SCRIPT:
+            measure(samples, name, session, lambda: step(session, i))
+            if think: time.sleep(think)
+    return samples
+
+def session_memory(sessions, rounds, loop, executor):
+    # Retained server memory per session, read right after opening and again once the script has
+    # filled the sessions with subjects, dialogs and views. Runs as its own pass on fresh sessions
+    # because tracing slows every handler down several times and would skew the latency table.
+    def retained():
+        gc.collect()
+        return tracemalloc.get_traced_memory()[0]
+
+    tracemalloc.start()
+    baseline = retained()
+    opened = []
+    for n in range(sessions):
+        s = Session(f"mem-{n}", loop, executor)
+        s.open_app()
+        opened.append(s)
+    after_open = retained()
+    list(executor.map(lambda s: run_session(s, rounds, 0.0), opened))
+    after_script = retained()
+    tracemalloc.stop()
+
+    for s in opened:
+        s.close()
+    per = max(sessions, 1)
+    return (after_open - baseline) / per, (after_script - baseline) / per
+
+def run(sessions=50, workers=16, rounds=3, think=0.0):
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+
+    # 1. Open every session
+    samples = []
+    opened = []
+    for n in range(sessions):
+        s = Session(f"load-{n}", loop, executor)
+        measure(samples, "open app", s, s.open_app)
+        opened.append(s)
+
+    # 2. Drive all sessions concurrently through the interaction script
+    start = time.perf_counter()
+    for result in executor.map(lambda s: run_session(s, rounds, think), opened):
+        samples += result
+    wall = time.perf_counter() - start
+
+    for s in opened:
+        s.close()
+
+    # 3. Same workload again under tracemalloc for the memory figures
+    per_session_mem = session_memory(sessions, rounds, loop, executor)
+    executor.shutdown()
+    loop.call_soon_threadsafe(loop.stop)
+    return samples, per_session_mem, wall
+
+def report(samples, per_session_mem, wall, sessions):
+    mem_open, mem_script = per_session_mem
+    print(f"{sessions} sessions, {len(samples)} interactions in {wall:.2f}s ({len(samples) / wall if wall else 0:.0f}/s)")
+    print(f"Server memory per session: {mem_open / 1024:.1f} KiB after open, {mem_script / 1024:.1f} KiB after script")
+    print(f"{'interaction':<18}{'n':>6}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}{'max ms':>9}{'msgs':>7}{'bytes':>9}")
+    names = list(dict.fromkeys(name for name, *_ in samples))
+    for name in names:
+        rows = [s for s in samples if s[0] == name]
+        lat = sorted(r[1] * 1000 for r in rows)
+        msgs = sum(r[2] for r in rows) / len(rows)
+        nbytes = sum(r[3] for r in rows) / len(rows)
+        print(f"{name:<18}{len(rows):>6}{percentile(lat, 50):>9.1f}{percentile(lat, 90):>9.1f}{percentile(lat, 99):>9.1f}{lat[-1]:>9.1f}{msgs:>7.1f}{nbytes:>9.0f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulate concurrent Bunkinator sessions")
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=16, help="handler threads, like flet's executor")
+    parser.add_argument("--rounds", type=int, default=3, help="times each session repeats the script")
+    parser.add_argument("--think", type=float, default=0.0, help="seconds between interactions")
+    args = parser.parse_args()
+    samples, mem, wall = run(args.sessions, args.workers, args.rounds, args.think)
+    report(samples, mem, wall, args.sessions)
@@ -2,6 +2,13 @@ import flet as ft
 import math
 import datetime
 import time
+import uuid
+
+from bunk_planner import OBJECTIVES, plan_bunks
+from catalog import compile_catalog, get_catalog
+from reminders import ReminderScheduler
+from reports import ASSETS_DIR, get_report_service, new_report_owner, report_url
+from sync import BASE_OWNER, FolderTransport, SyncReplica, mailbox_path, new_pairing_code
 
 # --- Constants ---
 GRID_TIME_SLOTS = [
@@ -54,7 +61,8 @@ def get_color(key):
     return colors.get(key, ft.Colors.RED)
 
 class Subject:
-    def __init__(self, name, attended=0, conducted=0, code="", professor="", schedule=None, assignments=None):
+    def __init__(self, name, attended=0, conducted=0, code="", professor="", schedule=None, assignments=None, uid=None):
+        self.uid = uid if uid else uuid.uuid4().hex
         self.name = name
         self.attended = attended
         self.conducted = conducted
@@ -81,29 +89,53 @@ class Subject:
 
     def to_dict(self):
         return {
-            "name": self.name, "attended": self.attended, "conducted": self.conducted,
+            "uid": self.uid, "name": self.name, "attended": self.attended, "conducted": self.conducted,
             "code": self.code, "professor": self.professor,
             "schedule": self.schedule, "assignments": self.assignments
         }
 
     @classmethod
-    def from_dict(cls, data):
+    def from_dict(cls, data, occurrence=0):
+        # Subjects saved before sync existed get an id derived from name+code, so the same
+        # subject on two devices is recognised as one record on their first sync. `occurrence`
+        # tells apart repeats of the same name+code in one list (see from_dicts).
+        uid = data.get("uid")
+        if not uid:
+            seed = f"bunkinator:{data.get('name', '')}:{data.get('code', '')}"
+            if occurrence: seed += f":{occurrence}"
+            uid = uuid.uuid5(uuid.NAMESPACE_URL, seed).hex
         return cls(
             name=data.get("name", "Unknown"), attended=data.get("attended", 0), conducted=data.get("conducted", 0),
             code=data.get("code", ""), professor=data.get("professor", ""),
-            schedule=data.get("schedule", []), assignments=data.get("assignments", [])
+            schedule=data.get("schedule", []), assignments=data.get("assignments", []), uid=uid
         )
 
+    @classmethod
+    def from_dicts(cls, dicts):
+        # Numbers repeated legacy name+code pairs in list order, so two "Lab" entries without a code
+        # become two records instead of overwriting each other in the sync log
+        seen = {}
+        out = []
+        for data in dicts:
+            key = (data.get("name", ""), data.get("code", ""))
+            occurrence = 0
+            if not data.get("uid"):
+                occurrence = seen.get(key, 0)
+                seen[key] = occurrence + 1
+            out.append(cls.from_dict(data, occurrence))
+        return out
+
 # --- Components ---
 
 class HeroCard(ft.Container):
-    def __init__(self):
+    def __init__(self, on_click=None):
         self.status_text = ft.Text("Welcome! Add subjects.", size=20, weight=ft.FontWeight.BOLD, color=ft.Colors.WHITE, text_align=ft.TextAlign.CENTER)
         super().__init__(
-            content=ft.Column([ft.Text("Safe Bunk Prediction", color=ft.Colors.WHITE70, size=14), self.status_text], alignment=ft.MainAxisAlignment.CENTER, horizontal_alignment=ft.CrossAxisAlignment.CENTER),
+            content=ft.Column([ft.Text("Safe Bunk Prediction • tap to plan", color=ft.Colors.WHITE70, size=14), self.status_text], alignment=ft.MainAxisAlignment.CENTER, horizontal_alignment=ft.CrossAxisAlignment.CENTER),
             gradient=ft.LinearGradient(begin=ft.alignment.top_left, end=ft.alignment.bottom_right, colors=["#3D5CFF", "#2C3E50"]),
             border_radius=20, padding=20, height=160, alignment=ft.alignment.center,
-            shadow=ft.BoxShadow(blur_radius=15, color=get_color("shadow"), offset=ft.Offset(0, 10))
+            shadow=ft.BoxShadow(blur_radius=15, color=get_color("shadow"), offset=ft.Offset(0, 10)),
+            on_click=on_click, ink=on_click is not None
         )
 
     def update_prediction(self, subjects):
@@ -365,12 +397,64 @@ def main(page: ft.Page):
     subjects = []
     stored_data = page.client_storage.get("subjects")
     if stored_data:
-        subjects = [Subject.from_dict(d) for d in stored_data]
+        subjects = Subject.from_dicts(stored_data)
+
+    # --- Reminders ---
+    def show_reminder(message):
+        page.open(ft.SnackBar(ft.Text(message), action="OK"))
+
+    reminders = ReminderScheduler(on_fire=show_reminder)
+    reminders.sync(subjects)
+    page.run_task(reminders.run)
+    page.on_close = lambda e: reminders.stop()
+
+    # --- Device Sync ---
+    replica = SyncReplica.load(page.client_storage)
+    if replica is None:
+        # First run with sync: existing totals belong to the shared base, not to this device
+        replica = SyncReplica()
+        replica.record([s.to_dict() for s in subjects], owner=BASE_OWNER)
+        replica.persist(page.client_storage, force=True)
 
     def save_data():
-        page.client_storage.set("subjects", [s.to_dict() for s in subjects])
+        data = [s.to_dict() for s in subjects]
+        page.client_storage.set("subjects", data)
+        if replica.record(data):
+            replica.persist(page.client_storage)
+        reminders.sync(subjects)
         refresh_all_views()
 
+    # Devices sync only with others using the same pairing code (enter it once on each device)
+    sync_code = ft.TextField(label="Pairing code", password=True, can_reveal_password=True)
+
+    def sync_devices(e):
+        try:
+            transport = FolderTransport(mailbox_path(sync_code.value))
+            replica.record([s.to_dict() for s in subjects]) # Anything not yet saved must go out too
+            pushed, pulled = transport.sync(replica)
+        except (OSError, ValueError) as ex:
+            page.open(ft.SnackBar(ft.Text(f"Sync failed: {ex}")))
+            return
+        page.client_storage.set("sync_code", sync_code.value.strip())
+        page.close(sync_dialog)
+        subjects[:] = Subject.from_dicts(replica.subjects())
+        replica.persist(page.client_storage, force=True)
+        save_data()
+        page.open(ft.SnackBar(ft.Text(f"Synced: sent {pushed}, received {pulled} changes")))
+
+    sync_dialog = ft.AlertDialog(
+        title=ft.Text("Sync Devices"),
+        content=ft.Column([
+            ft.Text("Use the same pairing code on your phone and laptop. Keep it private.", size=12),
+            sync_code
+        ], height=120, tight=True),
+        actions=[ft.TextButton("Sync", on_click=sync_devices), ft.TextButton("Cancel", on_click=lambda e: page.close(sync_dialog))]
+    )
+
+    def open_sync_dialog(e):
+        sync_code.value = page.client_storage.get("sync_code") or new_pairing_code()
+        page.open(sync_dialog)
+
     # --- DIALOGS ---
     
     # Scheduling Logic
@@ -468,23 +552,60 @@ def main(page: ft.Page):
         page.open(edit_dialog)
 
     # 2. Add Subject (EXPANDED)
-    add_name = ft.TextField(label="Subject Name")
+    # Typing in the name field autocompletes from the shared course catalog (if installed);
+    # picking a course fills in code, professor and its default schedule.
+    catalog = get_catalog()
+    add_schedule = []
+    add_suggestions = ft.Column(spacing=0, scroll=ft.ScrollMode.AUTO, height=0)
+
+    def on_add_name_change(e):
+        nonlocal add_schedule
+        add_schedule = [] # Typed by hand again, drop any previously picked course schedule
+        if catalog is None: return
+        matches = catalog.search(add_name.value, limit=6) if add_name.value else []
+        add_suggestions.controls = [
+            ft.ListTile(
+                title=ft.Text(c["name"], size=14),
+                subtitle=ft.Text(f"{c['code']} • {c['professor'] or 'No Prof Info'} • {len(c['schedule'])} slots", size=11),
+                dense=True,
+                on_click=lambda e, course=c: pick_course(course)
+            )
+            for c in matches
+        ]
+        add_suggestions.height = min(len(matches), 3) * 56
+        add_suggestions.update()
+
+    def pick_course(course):
+        nonlocal add_schedule
+        add_name.value = course["name"]
+        add_code.value = course["code"]
+        add_prof.value = course["professor"]
+        add_schedule = [s.copy() for s in course["schedule"]]
+        add_suggestions.controls = []
+        add_suggestions.height = 0
+        add_dialog.update()
+
+    add_name = ft.TextField(label="Subject Name", on_change=on_add_name_change)
     add_code = ft.TextField(label="Code (Optional)")
     add_prof = ft.TextField(label="Professor (Optional)")
     
     def save_new_sub(e):
+        nonlocal add_schedule
         if add_name.value:
-            new_sub = Subject(add_name.value, code=add_code.value, professor=add_prof.value)
+            new_sub = Subject(add_name.value, code=add_code.value, professor=add_prof.value, schedule=add_schedule)
             subjects.append(new_sub)
             add_name.value = ""
             add_code.value = ""
             add_prof.value = ""
+            add_schedule = []
+            add_suggestions.controls = []
+            add_suggestions.height = 0
             save_data()
             page.close(add_dialog)
 
     add_dialog = ft.AlertDialog(
         title=ft.Text("Add Subject"),
-        content=ft.Column([add_name, add_code, add_prof], height=200),
+        content=ft.Column([add_name, add_suggestions, add_code, add_prof], height=200 if catalog is None else 370, tight=True),
         actions=[ft.TextButton("Add", on_click=save_new_sub), ft.TextButton("Cancel", on_click=lambda e: page.close(add_dialog))]
     )
 
@@ -536,10 +657,46 @@ def main(page: ft.Page):
         page.open(assign_dialog)
 
 
+    # 4. Bunk Planner
+    planner_objective = ft.Dropdown(
+        label="Plan for",
+        value="free_days",
+        options=[ft.dropdown.Option(key, label) for key, (label, _) in OBJECTIVES.items()],
+        on_change=lambda e: update_bunk_plan(),
+        expand=True
+    )
+    planner_result = ft.Column(spacing=4, scroll=ft.ScrollMode.AUTO, height=260)
+
+    def update_bunk_plan():
+        plan = plan_bunks(subjects, planner_objective.value)
+        label = OBJECTIVES[plan["objective"]][0].lower()
+        if plan["blocks"]:
+            header = ft.Text(f"Skip {', '.join(plan['blocks'])} ({plan['bunks']} classes)", weight=ft.FontWeight.BOLD, color=get_color("text"))
+        else:
+            header = ft.Text(f"No {label} possible next week without dipping below 75% after a bunk.", weight=ft.FontWeight.BOLD, color=ft.Colors.RED_400)
+        rows = [header, ft.Text("Every subject stays at or above 75% after each skipped class, not just at the end of the week.", size=12, italic=True, color=get_color("text_secondary"))]
+        for sub, pct, spare in plan["projected"]:
+            rows.append(ft.Text(
+                f"{sub.code or sub.name}: {pct:.1f}% after next week • {spare} spare",
+                size=12, color=ft.Colors.RED_400 if pct < 75.0 else get_color("text_secondary")
+            ))
+        planner_result.controls = rows
+        if planner_result.page: planner_result.update()
+
+    planner_dialog = ft.AlertDialog(
+        title=ft.Text("Plan Next Week's Bunks"),
+        content=ft.Column([ft.Row([planner_objective]), planner_result], height=340, width=320),
+        actions=[ft.TextButton("Close", on_click=lambda e: page.close(planner_dialog))]
+    )
+
+    def open_bunk_planner(e):
+        update_bunk_plan()
+        page.open(planner_dialog)
+
     # --- VIEWS ---
 
     # VIEW 1: HOME
-    hero_card = HeroCard()
+    hero_card = HeroCard(on_click=open_bunk_planner)
     today_disp = ft.Column()
     upcoming_disp = ft.Column()
 
@@ -638,7 +795,7 @@ def main(page: ft.Page):
         
         # 3. Update Data & UI
         assign["completed"] = True
-        refresh_all_views()
+        save_data()
         page.update()
 
     # VIEW 2: TIMETABLE
@@ -708,11 +865,34 @@ def main(page: ft.Page):
     # VIEW 3: SUBJECTS
     sub_list_col = ft.Column(scroll=ft.ScrollMode.AUTO, expand=True)
     
+    def on_report_ready(future):
+        # Called from the pool's callback thread once the worker process has written the file
+        try:
+            path = future.result()
+        except Exception as ex:
+            page.open(ft.SnackBar(ft.Text(f"Report failed: {ex}")))
+            return
+        url = report_url(path, page.web)
+        page.open(ft.SnackBar(ft.Text("Semester report is ready"), action="Open", on_action=lambda e: page.launch_url(url)))
+
+    def generate_report(e):
+        owner = page.client_storage.get("report_owner")
+        if not owner:
+            owner = new_report_owner()
+            page.client_storage.set("report_owner", owner)
+        future = get_report_service().submit([s.to_dict() for s in subjects], owner, "pdf")
+        if not future.done():
+            page.open(ft.SnackBar(ft.Text("Preparing semester report...")))
+        future.add_done_callback(on_report_ready)
+
     def build_subjects_view():
         sub_list_col.controls = [SubjectCard(s, open_edit) for s in subjects]
         return ft.Container(
             content=ft.Column([
-                ft.Text("All Subjects", size=24, weight=ft.FontWeight.BOLD, color=get_color("text")),
+                ft.Row([
+                    ft.Text("All Subjects", size=24, weight=ft.FontWeight.BOLD, color=get_color("text")),
+                    ft.IconButton(ft.Icons.PICTURE_AS_PDF, icon_color="#3a58e8", tooltip="Semester report", on_click=generate_report)
+                ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
                 sub_list_col
             ]),
             padding=20, expand=True
@@ -727,7 +907,8 @@ def main(page: ft.Page):
         center_title=True,
         bgcolor="#3D5CFF",
         actions=[
-            ft.IconButton(ft.Icons.WB_SUNNY, on_click=toggle_theme, icon_color=ft.Colors.WHITE) 
+            ft.IconButton(ft.Icons.WB_SUNNY, on_click=toggle_theme, icon_color=ft.Colors.WHITE),
+            ft.IconButton(ft.Icons.SYNC, on_click=open_sync_dialog, icon_color=ft.Colors.WHITE, tooltip="Sync devices")
         ]
     )
 
@@ -795,4 +976,6 @@ def main(page: ft.Page):
     # Show disclaimer on startup
     page.open(disclaimer_dialog)
 
-ft.app(target=main)
+if __name__ == "__main__":
+    compile_catalog() # Recompile courses.csv before serving if it changed since the last build
+    ft.app(target=main, assets_dir=ASSETS_DIR)
@@ -0,0 +1,191 @@
+import asyncio
+import datetime
+import heapq
+import itertools
+import threading
+
+# --- Constants ---
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+CLASS_LEAD = datetime.timedelta(minutes=10)     # Remind this long before a class starts
+DEADLINE_REMINDER_TIME = datetime.time(9, 0)    # Remind at 09:00 on the day before a deadline
+
+# --- Event Helpers ---
+
+def slot_start(time_val):
+    # "08:00 - 08:50 (Theory)" -> datetime.time(8, 0)
+    hh, mm = time_val.split(' ')[0].split(':')
+    return datetime.time(int(hh), int(mm))
+
+def next_class_start(day, time_val, now):
+    # Next occurrence of a weekly slot that is still ahead of `now` (after the reminder lead)
+    start = slot_start(time_val)
+    days_ahead = (WEEKDAYS.index(day) - now.weekday()) % 7
+    when = datetime.datetime.combine(now.date() + datetime.timedelta(days=days_ahead), start)
+    if when - CLASS_LEAD <= now:
+        when += datetime.timedelta(days=7)
+    return when
+
+def subject_events(sub, now):
+    # Yields (key, fire_at, message, repeats_weekly) for every reminder a subject needs
+    label = sub.code if sub.code else sub.name
+    for slot in sub.schedule:
+        try:
+            start = next_class_start(slot["day"], slot["time"], now)
+        except (KeyError, ValueError, AttributeError):
+            continue # Unknown day or unparseable time, nothing to remind about
+        key = ("class", slot["day"], slot["time"])
+        yield key, start - CLASS_LEAD, f"{label} starts at {slot['time'].split(' ')[0]}", True
+
+    for i, a in enumerate(sub.assignments):
+        if a.get("completed"): continue
+        try:
+            deadline = datetime.date.fromisoformat(a["deadline"])
+        except (KeyError, ValueError):
+            continue
+        fire_at = datetime.datetime.combine(deadline - datetime.timedelta(days=1), DEADLINE_REMINDER_TIME)
+        if fire_at <= now: continue # Already past, the Home view shows it as overdue
+        key = ("assignment", i, a.get("title", ""), a["deadline"]) # Index: titles/deadlines may repeat
+        yield key, fire_at, f"'{a.get('title', '')}' ({sub.name}) is due tomorrow", False
+
+def subject_signature(sub):
+    # Cheap fingerprint of the fields reminders depend on, used to skip unchanged subjects
+    return (
+        sub.code, sub.name,
+        tuple((s["day"], s["time"]) for s in sub.schedule),
+        tuple((a.get("title"), a.get("deadline"), bool(a.get("completed"))) for a in sub.assignments),
+    )
+
+# --- Scheduler ---
+
+class ReminderScheduler:
+    # Keeps upcoming reminders in a min-heap and sleeps until the earliest one is due.
+    # Heap entries are [fire_at, seq, sub_id, key, message, repeats, alive]; removed or
+    # replaced reminders are only flagged dead and dropped lazily when they reach the top.
+
+    def __init__(self, on_fire, now_fn=datetime.datetime.now):
+        self.on_fire = on_fire
+        self.now_fn = now_fn
+        self._heap = []
+        self._entries = {}      # sub_id -> {key: heap entry}
+        self._signatures = {}   # sub_id -> subject_signature
+        self._subjects = {}     # sub_id -> Subject (keeps ids stable while tracked)
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._loop = None
+        self._wakeup = None
+        self._running = False
+
+    def __len__(self):
+        with self._lock:
+            return sum(len(e) for e in self._entries.values())
+
+    def sync(self, subjects):
+        # Incremental rebuild: only subjects whose schedule/assignments changed are touched.
+        # Safe to call from flet's worker threads.
+        now = self.now_fn()
+        changed = False
+        with self._lock:
+            current_ids = set()
+            for sub in subjects:
+                sub_id = id(sub)
+                current_ids.add(sub_id)
+                sig = subject_signature(sub)
+                if self._signatures.get(sub_id) == sig: continue
+                self._signatures[sub_id] = sig
+                self._subjects[sub_id] = sub
+                changed |= self._resync_subject(sub_id, sub, now)
+
+            for sub_id in list(self._signatures.keys() - current_ids):
+                for entry in self._entries.pop(sub_id, {}).values():
+                    entry[-1] = False
+                self._signatures.pop(sub_id, None)
+                self._subjects.pop(sub_id, None)
+                changed = True
+        if changed:
+            self._notify()
+
+    def _resync_subject(self, sub_id, sub, now):
+        old = self._entries.get(sub_id, {})
+        new = {}
+        changed = False
+        for key, fire_at, message, repeats in subject_events(sub, now):
+            if key in new: continue # Same slot listed twice, one reminder is enough
+            entry = old.pop(key, None)
+            if entry is not None and entry[-1]:
+                # Keep the existing entry, refresh the text in place (e.g. renamed subject)
+                entry[4] = message
+                new[key] = entry
+                continue
+            entry = [fire_at, next(self._seq), sub_id, key, message, repeats, True]
+            heapq.heappush(self._heap, entry)
+            new[key] = entry
+            changed = True
+        for entry in old.values():
+            entry[-1] = False
+            changed = True
+        if new:
+            self._entries[sub_id] = new
+        else:
+            self._entries.pop(sub_id, None)
+        return changed
+
+    def next_due(self):
+        with self._lock:
+            self._drop_dead()
+            return self._heap[0][0] if self._heap else None
+
+    def _drop_dead(self):
+        while self._heap and not self._heap[0][-1]:
+            heapq.heappop(self._heap)
+
+    def _pop_due(self, now):
+        fired = []
+        with self._lock:
+            self._drop_dead()
+            while self._heap and self._heap[0][0] <= now:
+                entry = heapq.heappop(self._heap)
+                if not entry[-1]: continue
+                fire_at, _, sub_id, key, message, repeats, _ = entry
+                entries = self._entries.get(sub_id, {})
+                if entries.get(key) is not entry: continue # No longer tracked, never fire it
+                if not repeats or now < fire_at + CLASS_LEAD:
+                    fired.append(message) # A class that already started (e.g. after sleep) is skipped
+                if repeats:
+                    # Weekly class: re-arm for the next occurrence after now, so weeks missed while
+                    # the machine slept are not replayed one by one
+                    _, day, time_val = key
+                    nxt = [next_class_start(day, time_val, now) - CLASS_LEAD, next(self._seq), sub_id, key, message, True, True]
+                    heapq.heappush(self._heap, nxt)
+                    entries[key] = nxt
+                else:
+                    del entries[key]
+                self._drop_dead()
+        return fired
+
+    def _notify(self):
+        if self._loop is not None and self._wakeup is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def run(self):
+        # Sleeps on an asyncio.Event with a timeout equal to the time until the next reminder,
+        # so an idle session costs nothing until something is due or the data changes.
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._running = True
+        while self._running:
+            self._wakeup.clear()
+            for message in self._pop_due(self.now_fn()):
+                self.on_fire(message)
+
+            due = self.next_due()
+            timeout = None if due is None else max((due - self.now_fn()).total_seconds(), 0)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+        self._loop = None
+
+    def stop(self):
+        self._running = False
+        self._notify()
@@ -0,0 +1,378 @@
+import argparse
+import concurrent.futures
+import concurrent.futures.process
+import hashlib
+import html
+import json
+import multiprocessing
+import os
+import re
+import secrets
+import threading
+import time
+
+# --- Semester Reports ---
+# Printable attendance summaries (HTML or PDF) rendered in worker processes so the flet event
+# handlers never block on them. Output is cached on disk under a hash of the subject data, so
+# an unchanged report is returned without touching the pool at all.
+
+REPORT_VERSION = 1 # Bump when the layout changes to invalidate cached reports
+REPORT_FORMATS = ["pdf", "html"]
+# Reports live under the app's flet assets dir so the web server can hand them to the browser.
+# BUNKINATOR_REPORT_DIR may pick another folder, but only one inside the assets dir, since the
+# URL a web session opens is the report's path relative to it.
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets")
+REPORT_CACHE_DIR = os.path.normpath(os.path.join(ASSETS_DIR, os.environ.get("BUNKINATOR_REPORT_DIR", "reports")))
+if os.path.relpath(REPORT_CACHE_DIR, ASSETS_DIR).startswith(os.pardir):
+    raise ValueError(f"BUNKINATOR_REPORT_DIR must be inside {ASSETS_DIR} so web clients can fetch reports")
+REPORT_MAX_AGE = 30 * 24 * 3600 # Reports untouched this long (abandoned students) are evicted
+REPORT_SWEEP_EVERY = 3600       # Seconds between age sweeps of the shared cache
+
+def report_url(path, web):
+    # Web sessions fetch the file over HTTP from the assets route; desktop opens it directly
+    if not web: return f"file://{path}"
+    rel = os.path.relpath(path, ASSETS_DIR)
+    if rel.startswith(os.pardir):
+        raise ValueError(f"{path} is outside the assets dir and can't be served")
+    return "/" + rel.replace(os.sep, "/")
+
+def report_key(subject_dicts, fmt):
+    payload = json.dumps([REPORT_VERSION, fmt, subject_dicts], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def new_report_owner():
+    return secrets.token_urlsafe(16)
+
+def cached_path(subject_dicts, fmt, owner, cache_dir=REPORT_CACHE_DIR):
+    # "<owner>/<content hash>.<fmt>": one folder per student holding their live report, and the
+    # random owner token keeps the served URL unguessable for other students
+    owner = re.sub(r"[^A-Za-z0-9_-]", "_", owner)
+    return os.path.join(cache_dir, owner, f"{report_key(subject_dicts, fmt)}.{fmt}")
+
+def replace_previous(keep_path):
+    # Drops the owner's older reports in the same format; only lists that owner's own folder
+    folder, keep = os.path.split(keep_path)
+    fmt = os.path.splitext(keep)[1]
+    for name in os.listdir(folder):
+        if name == keep or not name.endswith(fmt): continue
+        try:
+            os.remove(os.path.join(folder, name))
+        except OSError:
+            pass # Another worker got there first
+
+def evict_reports(cache_dir=REPORT_CACHE_DIR, max_age=REPORT_MAX_AGE):
+    # Removes reports nobody has opened for max_age (abandoned students) and their empty folders.
+    # Walks the whole cache, so ReportService runs it at most once per REPORT_SWEEP_EVERY.
+    cutoff = time.time() - max_age
+    removed = 0
+    try:
+        owners = os.listdir(cache_dir)
+    except OSError:
+        return 0
+    for owner in owners:
+        folder = os.path.join(cache_dir, owner)
+        if not os.path.isdir(folder): continue
+        try:
+            for name in os.listdir(folder):
+                path = os.path.join(folder, name)
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+                    removed += 1
+            if not os.listdir(folder): os.rmdir(folder)
+        except OSError:
+            pass # Raced with a worker writing into this folder, try again next sweep
+    return removed
+
+# --- Report Content ---
+
+def report_data(subject_dicts):
+    # main.py is imported here (inside the worker) rather than at module level: the app imports
+    # this module, and the workers need the same Subject model and Visual Grid schema.
+    from main import DAYS, VISUAL_COLS, Subject
+
+    subjects = Subject.from_dicts(subject_dicts)
+    rows = []
+    for sub in subjects:
+        done = sum(1 for a in sub.assignments if a.get("completed"))
+        rows.append({
+            "code": sub.code, "name": sub.name, "professor": sub.professor,
+            "attended": sub.attended, "conducted": sub.conducted, "percentage": sub.percentage,
+            "safe": sub.conducted == 0 or sub.percentage >= 75.0,
+            "bunk": sub.get_bunk_message(),
+            "assignments": f"{done}/{len(sub.assignments)}",
+            "pending": [a for a in sub.assignments if not a.get("completed")],
+        })
+
+    # Same cell mapping as WeeklyVisualGrid: one Theory and one Lab row per day
+    schedule_map = {}
+    for sub in subjects:
+        for slot in sub.schedule:
+            schedule_map[f"{slot['day']}_{slot['time']}"] = sub.code
+    header = [col["label"] for col in VISUAL_COLS]
+    grid = []
+    for day in DAYS:
+        for suffix, kind in (("Th", "t"), ("Lab", "l")):
+            cells = []
+            for col in VISUAL_COLS:
+                time_val = col[kind]
+                if time_val is None:
+                    cells.append(None) # No slot in this column (e.g. the Theory lunch break)
+                    continue
+                code = schedule_map.get(f"{day}_{time_val}")
+                cells.append("" if code is None else (code or "Class")) # Code is optional, label it like the grid
+            grid.append((f"{day[:3]} {suffix}", cells))
+    return rows, header, grid
+
+# --- HTML ---
+
+def render_html(subject_dicts):
+    rows, header, grid = report_data(subject_dicts)
+    e = html.escape
+    out = [
+        "<!DOCTYPE html><html><head><meta charset='utf-8'><title>Attendance Report</title><style>",
+        "body{font-family:sans-serif;margin:24px;color:#222}table{border-collapse:collapse;margin-bottom:24px}",
+        "th,td{border:1px solid #ccc;padding:4px 8px;font-size:12px}th{background:#F5F7FA}",
+        ".ok{color:#2e7d32;font-weight:bold}.risk{color:#c62828;font-weight:bold}",
+        ".slot{width:52px;text-align:center}.busy{background:#3D5CFF;color:#fff}.none{background:#fff;border:none}",
+        "@media print{body{margin:0}}</style></head><body>",
+        "<h1>Semester Attendance Report</h1>",
+        "<table><tr><th>Code</th><th>Subject</th><th>Professor</th><th>Attended</th><th>%</th><th>Bunk Margin</th><th>Assignments Done</th></tr>",
+    ]
+    for r in rows:
+        cls = "ok" if r["safe"] else "risk"
+        out.append(
+            f"<tr><td>{e(r['code'])}</td><td>{e(r['name'])}</td><td>{e(r['professor'] or 'No Prof Info')}</td>"
+            f"<td>{r['attended']}/{r['conducted']}</td><td class='{cls}'>{r['percentage']:.1f}%</td>"
+            f"<td>{e(r['bunk'])}</td><td>{r['assignments']}</td></tr>"
+        )
+    out.append("</table><h2>Weekly Timetable</h2><table><tr><th></th>")
+    out += [f"<th class='slot'>{e(h)}</th>" for h in header]
+    out.append("</tr>")
+    for label, cells in grid:
+        out.append(f"<tr><th>{e(label)}</th>")
+        for code in cells:
+            if code is None: out.append("<td class='slot none'></td>")
+            elif code: out.append(f"<td class='slot busy'>{e(code)}</td>")
+            else: out.append("<td class='slot'></td>")
+        out.append("</tr>")
+    out.append("</table>")
+
+    pending = [(r["name"], a) for r in rows for a in r["pending"]]
+    if pending:
+        out.append("<h2>Pending Work</h2><ul>")
+        for name, a in sorted(pending, key=lambda x: x[1].get("deadline", "")):
+            out.append(f"<li>{e(a.get('title', ''))} ({e(name)}) &middot; due {e(a.get('deadline', ''))}</li>")
+        out.append("</ul>")
+    out.append("</body></html>")
+    return "".join(out).encode("utf-8")
+
+# --- PDF ---
+# Minimal PDF 1.4 writer (Helvetica text + filled rectangles), enough for a table and the grid.
+
+PAGE_W, PAGE_H = 842, 595 # A4 landscape, points
+MARGIN = 36
+
+def pdf_text(s):
+    s = str(s).encode("latin-1", "replace").decode("latin-1")
+    return s.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+class PdfCanvas:
+    def __init__(self):
+        self.pages = []
+        self.ops = None
+        self.y = 0
+        self.new_page()
+
+    def new_page(self):
+        self.ops = []
+        self.pages.append(self.ops)
+        self.y = PAGE_H - MARGIN
+
+    def ensure(self, height):
+        if self.y - height < MARGIN: self.new_page()
+
+    def text(self, x, y, s, size=9, bold=False, rgb=(0, 0, 0)):
+        font = "F2" if bold else "F1"
+        self.ops.append(f"{rgb[0]} {rgb[1]} {rgb[2]} rg BT /{font} {size} Tf {x} {y} Td ({pdf_text(s)}) Tj ET")
+
+    def rect(self, x, y, w, h, rgb):
+        self.ops.append(f"{rgb[0]} {rgb[1]} {rgb[2]} rg {x} {y} {w} {h} re f")
+
+    def to_bytes(self):
+        objs = ["<< /Type /Catalog /Pages 2 0 R >>", None,
+                "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+                "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>"]
+        kids = []
+        for ops in self.pages:
+            stream = "\n".join(ops).encode("latin-1")
+            objs.append(f"<< /Length {len(stream)} >>\nstream\n".encode("latin-1") + stream + b"\nendstream")
+            objs.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_W} {PAGE_H}] "
+                        f"/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> /Contents {len(objs)} 0 R >>")
+            kids.append(f"{len(objs)} 0 R")
+        objs[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+        out = bytearray(b"%PDF-1.4\n")
+        offsets = []
+        for i, obj in enumerate(objs, start=1):
+            offsets.append(len(out))
+            body = obj if isinstance(obj, bytes) else obj.encode("latin-1")
+            out += f"{i} 0 obj\n".encode("latin-1") + body + b"\nendobj\n"
+        xref = len(out)
+        out += f"xref\n0 {len(objs) + 1}\n0000000000 65535 f \n".encode("latin-1")
+        out += "".join(f"{off:010d} 00000 n \n" for off in offsets).encode("latin-1")
+        out += f"trailer\n<< /Size {len(objs) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1")
+        return bytes(out)
+
+def render_pdf(subject_dicts):
+    rows, header, grid = report_data(subject_dicts)
+    c = PdfCanvas()
+    blue, green, red, grey, slot_bg = (0.24, 0.36, 1), (0.18, 0.49, 0.2), (0.78, 0.16, 0.16), (0.4, 0.4, 0.4), (0.93, 0.93, 0.93)
+
+    c.text(MARGIN, c.y - 18, "Semester Attendance Report", size=18, bold=True)
+    c.y -= 40
+
+    # 1. Subject table
+    cols = [("Code", 0), ("Subject", 60), ("Professor", 250), ("Attended", 400), ("%", 460), ("Bunk Margin", 510), ("Done", 640)]
+    def table_header():
+        for label, dx in cols:
+            c.text(MARGIN + dx, c.y, label, bold=True, rgb=grey)
+        c.y -= 16
+    table_header()
+    for r in rows:
+        if c.y - 14 < MARGIN:
+            c.new_page()
+            table_header()
+        values = [r["code"], r["name"][:38], (r["professor"] or "No Prof Info")[:30], f"{r['attended']}/{r['conducted']}",
+                  f"{r['percentage']:.1f}%", r["bunk"], r["assignments"]]
+        for (label, dx), val in zip(cols, values):
+            rgb = (green if r["safe"] else red) if label == "%" else (0, 0, 0)
+            c.text(MARGIN + dx, c.y, val, rgb=rgb, bold=label == "%")
+        c.y -= 14
+
+    # 2. Weekly grid, same columns/rows as the Visual View
+    cell_w, cell_h, label_w = 52, 16, 56
+    c.y -= 20
+    c.ensure(30 + (len(grid) + 1) * (cell_h + 2))
+    c.text(MARGIN, c.y, "Weekly Timetable", size=13, bold=True)
+    c.y -= 20
+    for i, h in enumerate(header):
+        c.text(MARGIN + label_w + i * (cell_w + 2) + 4, c.y, h, size=8, bold=True)
+    c.y -= cell_h + 2
+    for label, cells in grid:
+        c.text(MARGIN, c.y + 4, label, size=8, bold=True)
+        for i, code in enumerate(cells):
+            if code is None: continue
+            x = MARGIN + label_w + i * (cell_w + 2)
+            c.rect(x, c.y, cell_w, cell_h, blue if code else slot_bg)
+            if code: c.text(x + 3, c.y + 5, code[:10], size=7, rgb=(1, 1, 1))
+        c.y -= cell_h + 2
+
+    # 3. Pending assignments
+    pending = sorted(((r["name"], a) for r in rows for a in r["pending"]), key=lambda x: x[1].get("deadline", ""))
+    if pending:
+        c.y -= 16
+        c.ensure(30)
+        c.text(MARGIN, c.y, "Pending Work", size=13, bold=True)
+        c.y -= 18
+        for name, a in pending:
+            c.ensure(14)
+            c.text(MARGIN, c.y, f"{a.get('title', '')} ({name}) - due {a.get('deadline', '')}")
+            c.y -= 14
+    return c.to_bytes()
+
+RENDERERS = {"pdf": render_pdf, "html": render_html}
+
+# --- Generation ---
+
+def build_report(subject_dicts, owner, fmt="pdf", cache_dir=REPORT_CACHE_DIR):
+    # Worker entry point: returns the cached file if present, otherwise renders and stores it
+    # in place of the owner's previous report
+    if fmt not in RENDERERS:
+        raise ValueError(f"Unknown report format: {fmt}")
+    path = cached_path(subject_dicts, fmt, owner, cache_dir)
+    if os.path.exists(path): return path
+    data = RENDERERS[fmt](subject_dicts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path) # Atomic, so concurrent workers rendering the same report never clash
+    replace_previous(path)
+    return path
+
+class ReportService:
+    def __init__(self, max_workers=None, cache_dir=REPORT_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.max_workers = max_workers or os.cpu_count()
+        self._pool = self._new_pool()
+        self._last_sweep = 0.0
+
+    def _new_pool(self):
+        # "spawn" so workers don't inherit the flet server's threads and event loop
+        return concurrent.futures.ProcessPoolExecutor(
+            max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+        )
+
+    def _maybe_sweep(self):
+        # Age eviction on a timer instead of per build, so a batch of N students doesn't stat the
+        # whole cache N times; the sweep itself runs in a worker, off the caller's thread
+        now = time.time()
+        if now - self._last_sweep < REPORT_SWEEP_EVERY: return
+        self._last_sweep = now
+        try:
+            self._pool.submit(evict_reports, self.cache_dir)
+        except concurrent.futures.process.BrokenProcessPool:
+            pass # submit() below replaces the pool
+
+    def submit(self, subject_dicts, owner, fmt="pdf"):
+        # Cache hits resolve immediately in the caller's process, without a round trip to a worker
+        self._maybe_sweep()
+        path = cached_path(subject_dicts, fmt, owner, self.cache_dir)
+        if os.path.exists(path):
+            os.utime(path) # Still in use, keep it away from age eviction
+            future = concurrent.futures.Future()
+            future.set_result(path)
+            return future
+        try:
+            return self._pool.submit(build_report, subject_dicts, owner, fmt, self.cache_dir)
+        except concurrent.futures.process.BrokenProcessPool:
+            # A worker died (e.g. killed by the OS); start a fresh pool rather than failing forever
+            self._pool = self._new_pool()
+            return self._pool.submit(build_report, subject_dicts, owner, fmt, self.cache_dir)
+
+    def generate_batch(self, batch, fmt="pdf"):
+        # batch: list of (owner, subject dicts) pairs, one per student; returns paths in order
+        futures = [self.submit(subject_dicts, owner, fmt) for owner, subject_dicts in batch]
+        return [f.result() for f in futures]
+
+    def shutdown(self):
+        self._pool.shutdown()
+
+# --- Process-wide instance ---
+_service = None
+_service_lock = threading.Lock()
+
+def get_report_service():
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = ReportService()
+        return _service
+
+if __name__ == "__main__":
+    # python reports.py student1.json student2.json ... --format pdf
+    # Each file holds a "subjects" list as saved in client_storage.
+    parser = argparse.ArgumentParser(description="Generate attendance reports for many students")
+    parser.add_argument("files", nargs="+")
+    parser.add_argument("--format", choices=REPORT_FORMATS, default="pdf")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    batch = []
+    for name in args.files:
+        with open(name, encoding="utf-8") as f:
+            batch.append((os.path.splitext(os.path.basename(name))[0], json.load(f)))
+    service = ReportService(max_workers=args.workers)
+    for name, path in zip(args.files, service.generate_batch(batch, args.format)):
+        print(f"{name} -> {path}")
+    service.shutdown()
@@ -0,0 +1,270 @@
+import bisect
+import copy
+import hashlib
+import json
+import os
+import secrets
+import uuid
+
+# --- Device Sync ---
+# Every device keeps a replica of the subjects as a compacted change log and exchanges only the
+# operations the other side hasn't seen yet.
+#
+# Each op is {"o": origin device, "s": origin seq, "c": lamport clock, "r": subject uid,
+#             "f": field, "v": value} (+ "k": counter owner for counter fields).
+#   - Plain fields (name, code, professor, schedule, assignments, deleted) are last-writer-wins
+#     registers ordered by (clock, origin).
+#   - attended/conducted are PN-counters: "attended+" / "attended-" ops carry the owner's running
+#     total, merged with max(), so concurrent "Present (+1)" taps on two devices both survive.
+# Only the newest op per register / counter slot is kept, so the log is bounded by semester size
+# while a delta is bounded by what changed since the peer's version vector.
+
+LWW_FIELDS = ["name", "code", "professor", "schedule", "assignments", "deleted"]
+COUNTER_FIELDS = ["attended", "conducted"]
+BASE_OWNER = "base" # Owner of totals that existed before sync was set up (same on every device)
+
+# Root under which each user's mailbox lives. Deliberately no default: on a multi-user server a
+# fallback folder would be shared by every student, so folder sync stays off until this is set.
+SYNC_ROOT = os.environ.get("BUNKINATOR_SYNC_DIR")
+MIN_PAIRING_CODE = 12
+SNAPSHOT_EVERY = 50 # "sync_ops.N" chunks kept before the full log is rewritten
+
+def new_pairing_code():
+    return secrets.token_urlsafe(12)
+
+def mailbox_path(pairing_code, root=None):
+    # One mailbox per pairing code, so only the devices that share the code see each other's ops
+    root = root if root else SYNC_ROOT
+    if not root:
+        raise ValueError("Device sync is not configured on this server (set BUNKINATOR_SYNC_DIR)")
+    pairing_code = (pairing_code or "").strip()
+    if len(pairing_code) < MIN_PAIRING_CODE:
+        raise ValueError(f"Pairing code must be at least {MIN_PAIRING_CODE} characters")
+    return os.path.join(root, hashlib.sha256(pairing_code.encode("utf-8")).hexdigest())
+
+def op_key(op):
+    if "k" in op: return (op["r"], op["f"], op["k"])
+    return (op["r"], op["f"])
+
+def supersedes(new, old):
+    if "k" in new: return new["v"] > old["v"]
+    return (new["c"], new["o"]) > (old["c"], old["o"])
+
+class SyncReplica:
+    def __init__(self, replica_id=None):
+        self.replica_id = replica_id if replica_id else uuid.uuid4().hex
+        self.clock = 0
+        self.seq = 0
+        self.pushed = 0             # Last own seq written to a shared folder
+        self.vector = {}            # origin -> highest seq seen
+        self._log = {}              # op_key -> op
+        self._by_origin = {}        # origin -> ascending seqs (may hold superseded ones)
+        self._live = {}             # (origin, seq) -> op, for ops still in the log
+        self._records = {}          # uid -> {"fields": {f: op}, "counters": {f: {owner: v}}, "created": (c, o)}
+        self._unsaved = []          # Own ops emitted since the last persist()
+        self._chunks = 0            # "sync_ops.N" chunks written since the last snapshot
+
+    # --- Persistence ---
+
+    def to_dict(self):
+        return {
+            "replica": self.replica_id, "clock": self.clock, "seq": self.seq, "pushed": self.pushed,
+            "vector": self.vector, "log": list(self._log.values())
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        replica = cls(data.get("replica"))
+        for op in sorted(data.get("log", []), key=lambda op: (op["o"], op["s"])):
+            replica._store(op)
+        replica.clock = data.get("clock", 0)
+        replica.seq = data.get("seq", 0)
+        replica.pushed = data.get("pushed", 0)
+        replica.vector = dict(data.get("vector", {}))
+        return replica
+
+    @classmethod
+    def load(cls, storage):
+        # Full snapshot from "sync_state" plus the own-op chunks "sync_ops.0", "sync_ops.1", ...
+        # saved after it. Returns None when sync has never been set up on this device.
+        state = storage.get("sync_state")
+        if not state: return None
+        replica = cls.from_dict(state)
+        while True:
+            ops = storage.get(f"sync_ops.{replica._chunks}")
+            if ops is None: break
+            replica._chunks += 1
+            for op in ops:
+                replica._store(op) # Idempotent, so ops already folded into the snapshot are harmless
+                replica.seq = max(replica.seq, op["s"])
+                replica.clock = max(replica.clock, op["c"])
+                replica.vector[replica.replica_id] = replica.seq
+        return replica
+
+    def persist(self, storage, force=False):
+        # A save writes only the ops emitted since the previous save, as one new chunk, so a tap
+        # costs what changed. Every SNAPSHOT_EVERY chunks (or after a sync) the log is rewritten.
+        if force or self._chunks >= SNAPSHOT_EVERY:
+            storage.set("sync_state", self.to_dict())
+            for i in range(self._chunks):
+                storage.remove(f"sync_ops.{i}")
+            self._chunks = 0
+        elif self._unsaved:
+            storage.set(f"sync_ops.{self._chunks}", self._unsaved)
+            self._chunks += 1
+        self._unsaved = []
+
+    # --- Log ---
+
+    def _store(self, op):
+        key = op_key(op)
+        old = self._log.get(key)
+        if old is not None and not supersedes(op, old): return False
+        if old is not None:
+            self._live.pop((old["o"], old["s"]), None)
+        self._log[key] = op
+        self._live[(op["o"], op["s"])] = op
+        self._by_origin.setdefault(op["o"], []).append(op["s"])
+
+        rec = self._records.setdefault(op["r"], {"fields": {}, "counters": {}, "created": (op["c"], op["o"])})
+        rec["created"] = min(rec["created"], (op["c"], op["o"]))
+        if "k" in op:
+            rec["counters"].setdefault(op["f"], {})[op["k"]] = op["v"]
+        else:
+            rec["fields"][op["f"]] = op
+        return True
+
+    def _emit(self, uid, field, value, owner=None):
+        self.seq += 1
+        self.clock += 1
+        # Copy so later in-place edits of the app's lists can't rewrite the logged value
+        op = {"o": self.replica_id, "s": self.seq, "c": self.clock, "r": uid, "f": field, "v": copy.deepcopy(value)}
+        if owner is not None: op["k"] = owner
+        self._store(op)
+        self._unsaved.append(op)
+        self.vector[self.replica_id] = self.seq
+
+    def _ops_since(self, origin, seq):
+        seqs = self._by_origin.get(origin, [])
+        ops = []
+        for s in seqs[bisect.bisect_right(seqs, seq):]:
+            op = self._live.get((origin, s))
+            if op is not None: ops.append(op)
+        return ops
+
+    # --- Local changes ---
+
+    def _counter(self, rec, field):
+        up = rec["counters"].get(field + "+", {})
+        down = rec["counters"].get(field + "-", {})
+        return sum(up.values()) - sum(down.values())
+
+    def record(self, subject_dicts, owner=None):
+        # Diffs the app's current subjects against the replica and logs what changed locally.
+        # Returns the number of ops emitted.
+        owner = owner if owner else self.replica_id
+        before = self.seq
+        seen = set()
+        for data in subject_dicts:
+            uid = data["uid"]
+            seen.add(uid)
+            rec = self._records.get(uid, {"fields": {}, "counters": {}})
+            for field in LWW_FIELDS:
+                if field == "deleted": continue
+                op = rec["fields"].get(field)
+                if op is None or op["v"] != data.get(field):
+                    self._emit(uid, field, data.get(field))
+            rec = self._records[uid]
+            for field in COUNTER_FIELDS:
+                delta = data.get(field, 0) - self._counter(rec, field)
+                if delta == 0: continue
+                slot = field + ("+" if delta > 0 else "-")
+                current = rec["counters"].get(slot, {}).get(owner, 0)
+                self._emit(uid, slot, current + abs(delta), owner=owner)
+
+        for uid, rec in list(self._records.items()):
+            if uid in seen: continue
+            deleted = rec["fields"].get("deleted")
+            if deleted is None or not deleted["v"]:
+                self._emit(uid, "deleted", True)
+        return self.seq - before
+
+    # --- Exchange ---
+
+    def delta_since(self, vector):
+        # Ops the holder of `vector` is missing, cost proportional to the changes since then
+        ops = []
+        for origin in self._by_origin:
+            ops += self._ops_since(origin, vector.get(origin, 0))
+        return ops
+
+    def apply(self, ops):
+        applied = 0
+        for op in sorted(ops, key=lambda op: (op["o"], op["s"])):
+            if op["s"] <= self.vector.get(op["o"], 0): continue # Already have it
+            self.clock = max(self.clock, op["c"])
+            self.vector[op["o"]] = op["s"]
+            if self._store(op): applied += 1
+        return applied
+
+    def subjects(self):
+        # Materialised subject dicts (same shape as Subject.to_dict) in creation order
+        out = []
+        for uid, rec in sorted(self._records.items(), key=lambda kv: kv[1]["created"]):
+            fields = {f: copy.deepcopy(op["v"]) for f, op in rec["fields"].items()}
+            if fields.get("deleted"): continue
+            data = {"uid": uid}
+            for field in LWW_FIELDS:
+                if field != "deleted" and field in fields:
+                    data[field] = fields[field]
+            for field in COUNTER_FIELDS:
+                data[field] = self._counter(rec, field)
+            out.append(data)
+        return out
+
+def exchange(a, b):
+    # Direct two-way sync between replicas, standing in for a socket connection
+    to_b = a.delta_since(b.vector)
+    to_a = b.delta_since(a.vector)
+    return b.apply(to_b) + a.apply(to_a), len(to_a) + len(to_b)
+
+class FolderTransport:
+    # Per-user mailbox folder (see mailbox_path). Each device appends its own new ops as
+    # "<origin>-<first seq>-<last seq>.json"; readers only open files newer than their vector.
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def push(self, replica):
+        ops = replica._ops_since(replica.replica_id, replica.pushed)
+        if not ops: return 0
+        name = f"{replica.replica_id}-{ops[0]['s']:010d}-{ops[-1]['s']:010d}.json"
+        tmp = os.path.join(self.path, name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(ops, f, separators=(",", ":"))
+        os.replace(tmp, os.path.join(self.path, name))
+        replica.pushed = ops[-1]["s"]
+        return len(ops)
+
+    def pull(self, replica):
+        pending = []
+        for name in os.listdir(self.path):
+            if not name.endswith(".json"): continue
+            try:
+                origin, first, last = name[:-5].split("-")
+                first, last = int(first), int(last)
+            except ValueError:
+                continue
+            if origin == replica.replica_id or last <= replica.vector.get(origin, 0): continue
+            pending.append((origin, first, name))
+
+        ops = []
+        for _, _, name in sorted(pending):
+            with open(os.path.join(self.path, name), encoding="utf-8") as f:
+                ops += json.load(f)
+        return replica.apply(ops)
+
+    def sync(self, replica):
+        pushed = self.push(replica)
+        pulled = self.pull(replica)
+        return pushed, pulled
@@ -0,0 +1,64 @@
+import itertools
+import random
+
+from bunk_planner import OBJECTIVES, WEEK_DAYS, plan_bunks, slot_start
+
+class FakeSubject:
+    def __init__(self, name, attended, conducted, schedule):
+        self.name = name
+        self.code = name
+        self.attended = attended
+        self.conducted = conducted
+        self.schedule = schedule
+
+def slot(day, hour):
+    return {"day": day, "time": f"{hour:02d}:00 - {hour:02d}:50 (Theory)"}
+
+def lowest_after_bunk(sub, skipped):
+    # Walks the week in time order; attending never causes a drop, so only bunks are checked
+    attended, conducted, lowest = sub.attended, sub.conducted, 100.0
+    for s in sorted(sub.schedule, key=lambda s: (WEEK_DAYS.index(s["day"]), slot_start(s["time"]))):
+        conducted += 1
+        if any(s is k for k in skipped):
+            lowest = min(lowest, attended / conducted * 100)
+        else:
+            attended += 1
+    return lowest
+
+def test_early_bunk_refused_when_it_dips_mid_week():
+    # 3/4 now; skipping Monday gives 3/5 = 60% until the rest of the week catches up
+    days = ["Monday", "Tuesday", "Wednesday", "Thursday"]
+    sub = FakeSubject("MA101", 3, 4, [slot(day, 9) for day in days])
+    plan = plan_bunks([sub], "free_days")
+    assert plan["blocks"] == ["Thursday"]
+    assert lowest_after_bunk(sub, [s for _, s in plan["slots"]]) >= 75.0
+    assert plan["projected"][0][2] == 0
+
+def test_matches_brute_force_on_running_rule():
+    rng = random.Random(7)
+    for _ in range(150):
+        subjects = []
+        for n in range(rng.randint(1, 3)):
+            schedule = [slot(rng.choice(WEEK_DAYS[:5]), rng.choice([9, 11, 14, 16])) for _ in range(rng.randint(1, 6))]
+            conducted = rng.randint(0, 12)
+            subjects.append(FakeSubject(f"S{n}", rng.randint(conducted // 2, conducted), conducted, schedule))
+
+        for objective, (_, block_of) in OBJECTIVES.items():
+            blocks = {}
+            for sub in subjects:
+                for s in sub.schedule:
+                    kind = block_of(s["day"], slot_start(s["time"]))
+                    if kind: blocks.setdefault((s["day"], kind), []).append((sub, s))
+
+            best = (0, 0)
+            for r in range(len(blocks) + 1):
+                for combo in itertools.combinations(blocks.values(), r):
+                    skipped = [s for block in combo for _, s in block]
+                    if all(lowest_after_bunk(sub, skipped) >= 75.0 for sub in subjects):
+                        best = max(best, (r, -len(skipped)))
+
+            plan = plan_bunks(subjects, objective)
+            assert (len(plan["blocks"]), -plan["bunks"]) == best
+            skipped = [s for _, s in plan["slots"]]
+            for sub in subjects:
+                assert lowest_after_bunk(sub, skipped) >= 75.0
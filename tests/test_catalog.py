@@ -0,0 +1,89 @@
+import os
+import time
+
+import catalog
+from catalog import compile_catalog, get_catalog
+
+def write_csv(path, rows):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("code,name,professor,slots\n")
+        for row in rows:
+            f.write(row + "\n")
+
+def use_paths(monkeypatch, tmp_path):
+    src, dst = str(tmp_path / "courses.csv"), str(tmp_path / "courses.bkc")
+    monkeypatch.setattr(catalog, "CATALOG_CSV", src)
+    monkeypatch.setattr(catalog, "CATALOG_PATH", dst)
+    monkeypatch.setattr(catalog, "_catalog", None)
+    monkeypatch.setattr(catalog, "_catalog_loaded", False)
+    return src, dst
+
+def test_get_catalog_never_compiles(monkeypatch, tmp_path):
+    src, dst = use_paths(monkeypatch, tmp_path)
+    write_csv(src, ["MA101,Calculus,Dr. Rao,Monday 09:00 - 09:50 (Theory)"])
+    assert get_catalog() is None
+    assert not os.path.exists(dst)
+
+def test_compile_then_map(monkeypatch, tmp_path):
+    src, dst = use_paths(monkeypatch, tmp_path)
+    write_csv(src, ["MA101,Calculus,Dr. Rao,Monday 09:00 - 09:50 (Theory)"])
+    assert compile_catalog(src, dst)
+    assert not compile_catalog(src, dst) # Up to date
+
+    courses = get_catalog()
+    assert [c["code"] for c in courses.search("calc")] == ["MA101"]
+    courses.close()
+
+def test_stale_csv_keeps_serving_old_build(monkeypatch, tmp_path):
+    src, dst = use_paths(monkeypatch, tmp_path)
+    write_csv(src, ["MA101,Calculus,Dr. Rao,"])
+    compile_catalog(src, dst)
+    write_csv(src, ["PH101,Physics,Dr. Sen,"])
+    future = time.time() + 10
+    os.utime(src, (future, future))
+
+    courses = get_catalog()
+    assert len(courses) == 1 and courses.course(0)["code"] == "MA101"
+    courses.close()
+
+def build(tmp_path, rows):
+    src, dst = str(tmp_path / "courses.csv"), str(tmp_path / "courses.bkc")
+    write_csv(src, rows)
+    compile_catalog(src, dst)
+    return catalog.CourseCatalog(dst)
+
+def test_bad_slots_are_dropped_at_compile_time(tmp_path, caplog):
+    courses = build(tmp_path, [
+        "MA101,Calculus,Dr. Rao,Mon 09:00 - 09:50 (Theory); Tuesday; Monday 09:00 - 09:50 (Theory)",
+        "PH101,Physics,Dr. Sen,Saturday 09:00 - 09:50 (Theory); Friday 09:05 - 09:50 (Lab)",
+    ])
+    assert courses.course(0)["schedule"] == [{"day": "Monday", "time": "09:00 - 09:50 (Theory)"}]
+    assert courses.course(1)["schedule"] == []
+    assert "line 2" in caplog.text and "line 3" in caplog.text
+    courses.close()
+
+def test_search_prefix_substring_and_multi_word(tmp_path):
+    courses = build(tmp_path, [
+        "MA101,Linear Algebra,Dr. Rao,",
+        "CS201,Introduction to Algorithms,Dr. Iyer,",
+        "PH101,Quantum Physics,Dr. Sen,",
+    ])
+    assert [c["code"] for c in courses.search("ma1")] == ["MA101"]
+    assert [c["code"] for c in courses.search("gorith")] == ["CS201"] # Trigram substring
+    assert [c["code"] for c in courses.search("linear  alg")] == ["MA101"]
+    assert [c["code"] for c in courses.search("to algo")] == ["CS201"]
+    assert [c["code"] for c in courses.search("iyer")] == ["CS201"]
+    assert courses.search("zzz") == [] and courses.search("  ") == []
+    courses.close()
+
+def test_search_limit_and_dedupe(tmp_path):
+    rows = [f"AL{i:03d},Algebra {i},Dr. Algebra," for i in range(20)]
+    courses = build(tmp_path, rows)
+    # "algebra" hits each course through its name, its first word and its professor
+    hits = courses.search("algebra", limit=5)
+    assert len(hits) == 5 and len({c["code"] for c in hits}) == 5
+    hits = courses.search("algebra", limit=30) # Prefix hits, then trigram hits skip those already found
+    assert sorted(c["code"] for c in hits) == [f"AL{i:03d}" for i in range(20)]
+    hits = courses.search("lgebra", limit=30) # Substring only
+    assert sorted(c["code"] for c in hits) == [f"AL{i:03d}" for i in range(20)]
+    courses.close()
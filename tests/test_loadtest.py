@@ -0,0 +1,27 @@
+from loadtest import SCRIPT, LocalClientStorage, percentile, run
+
+def test_percentile():
+    vals = [1.0, 2.0, 3.0, 4.0, 5.0]
+    assert percentile([], 50) == 0.0
+    assert percentile(vals, 0) == 1.0
+    assert percentile(vals, 50) == 3.0
+    assert percentile(vals, 90) == 5.0
+    assert percentile(vals, 100) == 5.0
+
+def test_smoke_run_drives_every_step(monkeypatch, tmp_path):
+    storages = []
+    real_init = LocalClientStorage.__init__
+    def tracking_init(self, conn):
+        real_init(self, conn)
+        storages.append(self)
+    monkeypatch.setattr(LocalClientStorage, "__init__", tracking_init)
+
+    samples, (mem_open, mem_script), wall = run(sessions=2, workers=2, rounds=1)
+    names = ["open app"] + [name for name, _ in SCRIPT]
+    for name in names:
+        rows = [s for s in samples if s[0] == name]
+        assert len(rows) == 2, name
+        assert all(msgs > 0 for _, _, msgs, _ in rows), name
+    assert mem_script > mem_open > 0 and wall > 0
+    # The app really saved through the swapped-in storage, not flet's own
+    assert storages and all(storage.get("subjects") for storage in storages)
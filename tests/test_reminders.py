@@ -0,0 +1,101 @@
+import asyncio
+import datetime
+
+from reminders import ReminderScheduler
+
+class FakeSubject:
+    def __init__(self, name, code="", schedule=None, assignments=None):
+        self.name = name
+        self.code = code
+        self.schedule = schedule if schedule else []
+        self.assignments = assignments if assignments else []
+
+class Clock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+def lab_report(deadline="2026-10-25"):
+    return {"title": "Lab report", "deadline": deadline, "completed": False}
+
+def test_duplicate_assignments_both_fire_without_error():
+    clock = Clock(datetime.datetime(2026, 10, 19, 8, 0))
+    fired = []
+    scheduler = ReminderScheduler(fired.append, now_fn=clock)
+    sub = FakeSubject("Physics", assignments=[lab_report(), lab_report()])
+    scheduler.sync([sub])
+    assert len(scheduler) == 2
+
+    clock.now = datetime.datetime(2026, 10, 24, 9, 0)
+    assert scheduler._pop_due(clock.now) == ["'Lab report' (Physics) is due tomorrow"] * 2
+    assert len(scheduler) == 0
+
+def test_completed_assignment_never_fires():
+    clock = Clock(datetime.datetime(2026, 10, 19, 8, 0))
+    scheduler = ReminderScheduler(lambda message: None, now_fn=clock)
+    sub = FakeSubject("Physics", assignments=[lab_report(), lab_report()])
+    scheduler.sync([sub])
+
+    sub.assignments[1]["completed"] = True
+    scheduler.sync([sub])
+    assert len(scheduler) == 1
+    assert len(scheduler._pop_due(datetime.datetime(2026, 10, 24, 9, 0))) == 1
+
+    sub.assignments[0]["completed"] = True
+    scheduler.sync([sub])
+    assert scheduler._pop_due(datetime.datetime(2026, 10, 30, 9, 0)) == []
+
+def test_weekly_class_rearms_and_run_fires():
+    clock = Clock(datetime.datetime(2026, 10, 19, 8, 49, 59)) # Monday
+    fired = []
+    scheduler = ReminderScheduler(fired.append, now_fn=clock)
+    scheduler.sync([FakeSubject("Maths", "MA101", schedule=[{"day": "Monday", "time": "09:00 - 09:50 (Theory)"}])])
+    assert scheduler.next_due() == datetime.datetime(2026, 10, 19, 8, 50)
+
+    async def drive():
+        task = asyncio.create_task(scheduler.run())
+        await asyncio.sleep(0.05)
+        clock.now = datetime.datetime(2026, 10, 19, 8, 50)
+        scheduler._notify()
+        await asyncio.sleep(0.05)
+        scheduler.stop()
+        await task
+
+    asyncio.run(drive())
+    assert fired == ["MA101 starts at 09:00"]
+    assert scheduler.next_due() == datetime.datetime(2026, 10, 26, 8, 50)
+
+def test_removed_subject_drops_reminders():
+    clock = Clock(datetime.datetime(2026, 10, 19, 8, 0))
+    scheduler = ReminderScheduler(lambda message: None, now_fn=clock)
+    sub = FakeSubject("Physics", assignments=[lab_report()])
+    scheduler.sync([sub])
+    scheduler.sync([])
+    assert len(scheduler) == 0
+    assert scheduler.next_due() is None
+
+def test_bad_slots_are_skipped():
+    clock = Clock(datetime.datetime(2026, 10, 19, 8, 0))
+    scheduler = ReminderScheduler(lambda message: None, now_fn=clock)
+    schedule = [{"day": "Mon", "time": "09:00 - 09:50 (Theory)"}, {"day": "Tuesday", "time": ""},
+                {"day": "Tuesday", "time": "09:00 - 09:50 (Theory)"}]
+    scheduler.sync([FakeSubject("Maths", "MA", schedule=schedule)])
+    assert len(scheduler) == 1
+    assert scheduler.next_due() == datetime.datetime(2026, 10, 20, 8, 50)
+
+def test_wake_after_sleep_does_not_replay_missed_weeks():
+    clock = Clock(datetime.datetime(2026, 10, 19, 8, 0)) # Monday
+    scheduler = ReminderScheduler(lambda message: None, now_fn=clock)
+    scheduler.sync([FakeSubject("Maths", "MA", schedule=[{"day": "Monday", "time": "09:00 - 09:50 (Theory)"}])])
+
+    # Asleep for three weeks, woken at 12:00 on a Monday: that day's class already started
+    woke = datetime.datetime(2026, 11, 9, 12, 0)
+    assert scheduler._pop_due(woke) == []
+    assert scheduler.next_due() == datetime.datetime(2026, 11, 16, 8, 50)
+
+    # Woken inside the lead window: the class is still ahead, fire once
+    woke = datetime.datetime(2026, 11, 16, 8, 55)
+    assert scheduler._pop_due(woke) == ["MA starts at 09:00"]
+    assert scheduler.next_due() == datetime.datetime(2026, 11, 23, 8, 50)
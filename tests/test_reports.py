@@ -0,0 +1,83 @@
+import os
+import time
+
+import pytest
+
+import reports
+from reports import ReportService, build_report, cached_path, evict_reports
+
+def subject(attended):
+    return [{"uid": "u1", "name": "Maths", "code": "MA101", "professor": "", "schedule": [], "assignments": [],
+             "attended": attended, "conducted": 10}]
+
+def listing(cache):
+    return sorted(os.path.relpath(os.path.join(root, f), cache) for root, _, files in os.walk(cache) for f in files)
+
+def test_new_report_replaces_owners_previous_one(tmp_path):
+    cache = str(tmp_path)
+    first = build_report(subject(8), "alice", "html", cache)
+    assert build_report(subject(8), "alice", "html", cache) == first # Unchanged data hits the cache
+
+    second = build_report(subject(9), "alice", "html", cache)
+    bob = build_report(subject(9), "bob", "html", cache)
+    assert second != first and bob != second
+    assert listing(cache) == sorted(os.path.relpath(p, cache) for p in (second, bob))
+
+def write_report(path, age_days=0):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(b"%PDF")
+    when = time.time() - age_days * 24 * 3600
+    os.utime(path, (when, when))
+
+def test_age_eviction_drops_abandoned_reports(tmp_path):
+    cache = str(tmp_path)
+    stale = cached_path(subject(5), "pdf", "carol", cache)
+    keep = cached_path(subject(5), "pdf", "dave", cache)
+    write_report(stale, age_days=40)
+    write_report(keep)
+    assert evict_reports(cache) == 1
+    assert listing(cache) == [os.path.relpath(keep, cache)]
+
+def test_age_sweep_runs_once_per_interval(tmp_path, monkeypatch):
+    cache = str(tmp_path)
+    service = ReportService(max_workers=1, cache_dir=cache)
+    swept = []
+    monkeypatch.setattr(service._pool, "submit", lambda fn, *args: swept.append(fn))
+    for owner in ("a", "b", "c"):
+        write_report(cached_path(subject(5), "pdf", owner, cache))
+        service.submit(subject(5), owner, "pdf") # Cache hits
+    assert swept == [evict_reports]
+
+    monkeypatch.setattr(reports, "REPORT_SWEEP_EVERY", 0)
+    service.submit(subject(5), "a", "pdf")
+    assert swept == [evict_reports] * 2
+    service.shutdown()
+
+def test_subject_without_code_still_fills_the_grid():
+    from reports import report_data
+
+    sub = dict(subject(8)[0], code="", schedule=[{"day": "Monday", "time": "09:00 - 09:50 (Theory)"}])
+    _, header, grid = report_data([sub])
+    label, cells = grid[0]
+    assert label == "Mon Th" and cells[header.index("09:00")] == "Class"
+    assert cells[header.index("10:00")] == "" and cells[header.index("Lunch")] is None
+
+def test_web_url_is_the_path_under_assets():
+    path = cached_path(subject(5), "pdf", "alice", os.path.join(reports.ASSETS_DIR, "cache", "reports"))
+    assert reports.report_url(path, web=True) == "/cache/reports/alice/" + os.path.basename(path)
+    assert reports.report_url(path, web=False) == f"file://{path}"
+    with pytest.raises(ValueError):
+        reports.report_url("/tmp/elsewhere/alice/x.pdf", web=True)
+
+def test_report_dir_override_must_stay_under_assets(monkeypatch):
+    import importlib
+
+    monkeypatch.setenv("BUNKINATOR_REPORT_DIR", "/tmp/reports")
+    with pytest.raises(ValueError):
+        importlib.reload(reports)
+    monkeypatch.setenv("BUNKINATOR_REPORT_DIR", "cache/reports")
+    importlib.reload(reports)
+    assert reports.REPORT_CACHE_DIR == os.path.join(reports.ASSETS_DIR, "cache", "reports")
+    monkeypatch.delenv("BUNKINATOR_REPORT_DIR")
+    importlib.reload(reports)
@@ -0,0 +1,134 @@
+import json
+
+import pytest
+
+import sync
+from sync import FolderTransport, SyncReplica, mailbox_path
+
+def make_subject():
+    return {"uid": "u1", "name": "Maths", "code": "MA101", "professor": "", "schedule": [], "assignments": [],
+            "attended": 3, "conducted": 4}
+
+def test_in_place_append_syncs_through_folder(tmp_path):
+    phone, laptop = SyncReplica(), SyncReplica()
+    transport = FolderTransport(str(tmp_path))
+
+    sub = make_subject()
+    phone.record([sub])
+    transport.sync(phone)
+    transport.sync(laptop)
+
+    # The app mutates the same lists it handed to record(), like save_assignment does
+    sub["assignments"].append({"title": "HW1", "deadline": "2026-11-01", "completed": False})
+    sub["schedule"].append({"day": "Monday", "time": "09:00 - 09:50 (Theory)"})
+    assert phone.record([sub]) == 2
+
+    transport.sync(phone)
+    transport.sync(laptop)
+    synced = laptop.subjects()[0]
+    assert synced["assignments"] == [{"title": "HW1", "deadline": "2026-11-01", "completed": False}]
+    assert synced["schedule"] == [{"day": "Monday", "time": "09:00 - 09:50 (Theory)"}]
+
+def test_subjects_output_is_detached_from_log():
+    replica = SyncReplica()
+    replica.record([make_subject()])
+    out = replica.subjects()
+    out[0]["assignments"].append({"title": "HW1", "deadline": "2026-11-01", "completed": False})
+    assert replica.record(out) == 1
+
+def test_concurrent_increments_merge(tmp_path):
+    phone, laptop = SyncReplica(), SyncReplica()
+    transport = FolderTransport(str(tmp_path))
+    phone.record([make_subject()])
+    transport.sync(phone)
+    transport.sync(laptop)
+
+    for replica in (phone, laptop):
+        sub = replica.subjects()[0]
+        sub["attended"] += 1
+        sub["conducted"] += 1
+        replica.record([sub])
+
+    transport.sync(phone)
+    transport.sync(laptop)
+    transport.sync(phone)
+    assert phone.subjects()[0]["attended"] == laptop.subjects()[0]["attended"] == 5
+    assert phone.subjects()[0]["conducted"] == laptop.subjects()[0]["conducted"] == 6
+
+def test_mailbox_is_scoped_to_pairing_code(tmp_path):
+    root = str(tmp_path)
+    assert mailbox_path("alice-code-123456", root) == mailbox_path(" alice-code-123456 ", root)
+    assert mailbox_path("alice-code-123456", root) != mailbox_path("bob-code-1234567", root)
+
+def test_mailbox_requires_root_and_long_code(tmp_path, monkeypatch):
+    monkeypatch.setattr(sync, "SYNC_ROOT", None)
+    with pytest.raises(ValueError):
+        mailbox_path("alice-code-123456", None)
+    with pytest.raises(ValueError):
+        mailbox_path("short", str(tmp_path))
+
+class DictStorage:
+    def __init__(self):
+        self.data = {}
+        self.writes = []
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value):
+        self.data[key] = json.loads(json.dumps(value))
+        self.writes.append((key, len(json.dumps(value))))
+
+    def remove(self, key):
+        self.data.pop(key, None)
+
+def test_persist_writes_only_new_ops_and_reloads():
+    storage = DictStorage()
+    replica = SyncReplica()
+    subjects = [dict(make_subject(), uid=f"u{i}", name=f"S{i}") for i in range(50)]
+    replica.record(subjects)
+    replica.persist(storage, force=True)
+    snapshot_size = storage.writes[-1][1]
+
+    for _ in range(10):
+        storage.writes.clear()
+        subjects[7]["attended"] += 1
+        subjects[7]["conducted"] += 1
+        replica.record(subjects)
+        replica.persist(storage)
+        assert len(storage.writes) == 1 and storage.writes[0][0].startswith("sync_ops.")
+        assert storage.writes[0][1] < snapshot_size / 20
+
+    reloaded = SyncReplica.load(storage)
+    assert reloaded.subjects() == replica.subjects()
+    assert reloaded.seq == replica.seq
+    assert reloaded.delta_since({}) == replica.delta_since({})
+
+def test_snapshot_clears_chunks():
+    storage = DictStorage()
+    replica = SyncReplica()
+    sub = make_subject()
+    replica.record([sub])
+    replica.persist(storage)
+    replica.persist(storage, force=True)
+    sub["attended"] += 1
+    replica.record([sub])
+    replica.persist(storage)
+    replica.persist(storage, force=True)
+    assert not any(key.startswith("sync_ops.") for key in storage.data)
+    assert SyncReplica.load(storage).subjects() == replica.subjects()
+
+def test_identical_legacy_subjects_stay_separate():
+    from main import Subject
+
+    legacy = [{"name": "Lab", "attended": 3, "conducted": 4}, {"name": "Lab", "attended": 1, "conducted": 2}]
+    subjects = Subject.from_dicts(legacy)
+    assert subjects[0].uid != subjects[1].uid
+    # Same ids on another device loading the same legacy list
+    assert [s.uid for s in Subject.from_dicts(legacy)] == [s.uid for s in subjects]
+
+    replica = SyncReplica()
+    replica.record([s.to_dict() for s in subjects])
+    assert replica.record([s.to_dict() for s in subjects]) == 0 # Unchanged save emits nothing
+    synced = Subject.from_dicts(replica.subjects())
+    assert [(s.name, s.attended, s.conducted) for s in synced] == [("Lab", 3, 4), ("Lab", 1, 2)]